@@ -4,15 +4,22 @@ Generate a complete documentation book from individual chapters.
 Can output HTML, PDF, or combined markdown.
 """
 
-import os
+import hashlib
+import io
 from pathlib import Path
 import argparse
 from datetime import datetime
 
+# Characters rewritten when turning a chapter title into a TOC anchor
+_ANCHOR_TABLE = str.maketrans({' ': '-', '(': '', ')': ''})
+
+# Changes to this script (templates, extensions, anchor rules) invalidate builds
+_GENERATOR_DIGEST = hashlib.blake2b(Path(__file__).read_bytes()).hexdigest()
+
 class BookGenerator:
     def __init__(self, docs_dir: str):
         self.docs_dir = Path(docs_dir)
-        self.chapters = [
+        chapters = [
             ("README.md", "Introduction to the Documentation"),
             ("01-introduction.md", "Introduction"),
             ("02-installation.md", "Installation"),
@@ -25,45 +32,120 @@ class BookGenerator:
             ("09-contributing.md", "Contributing"),
             ("10-appendix.md", "Appendix"),
         ]
+        self.chapters = [(f, t, self._slug(t)) for f, t in chapters]
+        self._chapter_cache = {}
+        self._md = None
     
-    def generate_combined_markdown(self, output_file: str):
-        """Generate a single markdown file with all chapters."""
+    @staticmethod
+    def _slug(title: str) -> str:
+        """Convert a chapter title to its markdown anchor."""
+        return title.lower().translate(_ANCHOR_TABLE)
+    
+    def _chapter_stamp(self, filename: str):
+        """Return (mtime_ns, size) for a chapter, or None if it is missing."""
+        try:
+            stat = (self.docs_dir / filename).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_chapter(self, filename: str) -> str:
+        """Read a chapter file, caching its content until the file changes."""
+        # Stamp before reading so a concurrent edit yields a stale stamp,
+        # which only ever forces an extra rebuild
+        stamp = self._chapter_stamp(filename)
+        cached = self._chapter_cache.get(filename)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        content = (self.docs_dir / filename).read_text(encoding='utf-8')
+        self._chapter_cache[filename] = (stamp, content)
+        return content
+    
+    def _write_combined(self, f) -> dict:
+        """Write the combined markdown book to a file-like object.
+        
+        Returns the stamp of each chapter as it was read.
+        """
+        stamps = {}
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        with open(output_file, 'w') as f:
-            # Write book header
-            f.write("# zctor Documentation Book\n\n")
-            f.write("A comprehensive guide to the zctor actor framework for Zig.\n\n")
-            f.write(f"*Generated on {timestamp}*\n\n")
-            f.write("---\n\n")
-            
-            # Write table of contents
-            f.write("## Table of Contents\n\n")
-            for i, (filename, title) in enumerate(self.chapters, 1):
-                f.write(f"{i}. [{title}](#{title.lower().replace(' ', '-').replace('(', '').replace(')', '')})\n")
-            f.write("\n---\n\n")
-            
-            # Write each chapter
-            for i, (filename, title) in enumerate(self.chapters, 1):
-                chapter_file = self.docs_dir / filename
-                if chapter_file.exists():
-                    f.write(f"# {i}. {title}\n\n")
-                    
-                    with open(chapter_file, 'r') as chapter:
-                        content = chapter.read()
-                        # Skip the first header line if it exists
-                        lines = content.split('\n')
-                        if lines and lines[0].startswith('#'):
-                            content = '\n'.join(lines[1:])
-                        f.write(content)
-                    
-                    f.write("\n\n---\n\n")
-                else:
-                    f.write(f"# {i}. {title}\n\n*Chapter not found: {filename}*\n\n---\n\n")
+        # Write book header
+        f.write("# zctor Documentation Book\n\n")
+        f.write("A comprehensive guide to the zctor actor framework for Zig.\n\n")
+        f.write(f"*Generated on {timestamp}*\n\n")
+        f.write("---\n\n")
+        
+        # Write table of contents
+        f.write("## Table of Contents\n\n")
+        for i, (filename, title, anchor) in enumerate(self.chapters, 1):
+            f.write(f"{i}. [{title}](#{anchor})\n")
+        f.write("\n---\n\n")
+        
+        # Write each chapter
+        for i, (filename, title, _) in enumerate(self.chapters, 1):
+            chapter_file = self.docs_dir / filename
+            if chapter_file.exists():
+                f.write(f"# {i}. {title}\n\n")
+                
+                content = self._read_chapter(filename)
+                stamps[filename] = self._chapter_cache[filename][0]
+                # Skip the first header line if it exists
+                if content.startswith('#'):
+                    nl = content.find('\n')
+                    content = content[nl + 1:] if nl >= 0 else ''
+                f.write(content)
+                
+                f.write("\n\n---\n\n")
+            else:
+                f.write(f"# {i}. {title}\n\n*Chapter not found: {filename}*\n\n---\n\n")
+        
+        return stamps
+    
+    def _chapters_key(self, output_format: str, stamps: dict = None) -> str:
+        """Hash the format, generator and chapter stamps into a build key.
+        
+        Without stamps, the chapters are stat()ed now.
+        """
+        digest = hashlib.blake2b()
+        digest.update(f"{output_format}:{_GENERATOR_DIGEST}|".encode('utf-8'))
+        for filename, title, _ in self.chapters:
+            if stamps is None:
+                stamp = self._chapter_stamp(filename)
+            else:
+                stamp = stamps.get(filename)
+            if stamp is None:
+                entry = f"{filename}:{title}:missing|"
+            else:
+                entry = f"{filename}:{title}:{stamp[0]}:{stamp[1]}|"
+            digest.update(entry.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _is_up_to_date(self, output_file: str, key: str) -> bool:
+        """Check whether output_file was built from the current chapters."""
+        key_file = Path(output_file + '.key')
+        try:
+            return (Path(output_file).exists() and
+                    key_file.read_text(encoding='utf-8') == key)
+        except OSError:
+            return False
+    
+    def generate_combined_markdown(self, output_file: str, force: bool = False):
+        """Generate a single markdown file with all chapters."""
+        key = self._chapters_key('markdown')
+        if not force and self._is_up_to_date(output_file, key):
+            print(f"Combined markdown book up to date: {output_file}")
+            return
+        
+        # Many small writes; a larger buffer keeps the syscall count down
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            stamps = self._write_combined(f)
+        # Key the output by what was actually written, not the earlier stat
+        key = self._chapters_key('markdown', stamps)
+        Path(output_file + '.key').write_text(key, encoding='utf-8')
         
         print(f"Combined markdown book generated: {output_file}")
     
-    def generate_html(self, output_file: str):
+    def generate_html(self, output_file: str, force: bool = False):
         """Generate HTML book (requires markdown processor)."""
         try:
             import markdown
@@ -72,15 +154,21 @@ class BookGenerator:
             print("Install with: pip install markdown")
             return
         
-        # Generate combined markdown first
-        temp_md = "temp_book.md"
-        self.generate_combined_markdown(temp_md)
+        key = self._chapters_key('html')
+        if not force and self._is_up_to_date(output_file, key):
+            print(f"HTML book up to date: {output_file}")
+            return
         
-        # Convert to HTML
-        with open(temp_md, 'r') as f:
-            md_content = f.read()
+        # Generate combined markdown in memory
+        buf = io.StringIO()
+        stamps = self._write_combined(buf)
+        md_content = buf.getvalue()
+        key = self._chapters_key('html', stamps)
         
-        html_content = markdown.markdown(md_content, extensions=['toc', 'codehilite'])
+        # Convert to HTML, reusing one processor across builds
+        if self._md is None:
+            self._md = markdown.Markdown(extensions=['toc', 'codehilite'])
+        html_content = self._md.reset().convert(md_content)
         
         # Wrap in HTML document
         full_html = f"""<!DOCTYPE html>
@@ -105,17 +193,15 @@ class BookGenerator:
 </body>
 </html>"""
         
-        with open(output_file, 'w') as f:
-            f.write(full_html)
+        Path(output_file).write_text(full_html, encoding='utf-8')
+        Path(output_file + '.key').write_text(key, encoding='utf-8')
         
-        # Clean up temp file
-        os.remove(temp_md)
         print(f"HTML book generated: {output_file}")
     
     def list_chapters(self):
         """List all available chapters."""
         print("Available chapters:")
-        for i, (filename, title) in enumerate(self.chapters, 1):
+        for i, (filename, title, _) in enumerate(self.chapters, 1):
             chapter_file = self.docs_dir / filename
             status = "✓" if chapter_file.exists() else "✗"
             print(f"  {i:2d}. {status} {title} ({filename})")
@@ -125,7 +211,7 @@ class BookGenerator:
         print("Validating chapters...")
         all_valid = True
         
-        for filename, title in self.chapters:
+        for filename, title, _ in self.chapters:
             chapter_file = self.docs_dir / filename
             if not chapter_file.exists():
                 print(f"  ✗ Missing: {title} ({filename})")
@@ -135,12 +221,20 @@ class BookGenerator:
                 all_valid = False
             else:
                 try:
-                    with open(chapter_file, 'r') as f:
-                        content = f.read()
-                        if len(content.strip()) == 0:
-                            print(f"  ⚠ Empty: {title} ({filename})")
-                        else:
-                            print(f"  ✓ Valid: {title} ({filename}) - {len(content)} chars")
+                    size = chapter_file.stat().st_size
+                    # Only tiny or already-loaded chapters need their content
+                    # inspected to tell whitespace-only files apart
+                    if size == 0:
+                        empty = True
+                    elif size < 64 or filename in self._chapter_cache:
+                        empty = not self._read_chapter(filename).strip()
+                    else:
+                        empty = False
+                    
+                    if empty:
+                        print(f"  ⚠ Empty: {title} ({filename})")
+                    else:
+                        print(f"  ✓ Valid: {title} ({filename}) - {size} bytes")
                 except Exception as e:
                     print(f"  ✗ Error reading: {title} ({filename}) - {e}")
                     all_valid = False
@@ -156,6 +250,8 @@ def main():
     parser.add_argument("--output", "-o", help="Output file")
     parser.add_argument("--list", action="store_true", help="List available chapters")
     parser.add_argument("--validate", action="store_true", help="Validate chapters")
+    parser.add_argument("--force", action="store_true",
+                       help="Rebuild even if chapters are unchanged")
     
     args = parser.parse_args()
     
@@ -180,9 +276,9 @@ def main():
     
     # Generate book
     if args.format == "html":
-        generator.generate_html(output_file)
+        generator.generate_html(output_file, force=args.force)
     else:
-        generator.generate_combined_markdown(output_file)
+        generator.generate_combined_markdown(output_file, force=args.force)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
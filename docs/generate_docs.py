@@ -4,171 +4,236 @@ Auto-documentation generator for zctor
 Extracts documentation from source files and generates markdown documentation.
 """
 
-import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict
+
+# Markdown emitted for each documented type and function
+_TYPE_TEMPLATE = "#### `{name}`\n\n{doc}```zig\n{type}\n```\n\n"
+_FUNC_TEMPLATE = "#### `{name}`\n\n{doc}```zig\npub fn {name}({params}){ret}\n```\n\n"
+
+# Matches a //! or /// comment, a pub fn or a pub const declaration at the
+# start of a line. Whitespace never spans lines, mirroring a per-line scan.
+# Operates on raw bytes so only the captured groups need decoding.
+_DECL_RE = re.compile(
+    rb'^[^\S\n]*(?:'
+    rb'(?P<doc>//[!/])(?P<text>.*)'
+    rb'|pub fn [^\S\n]*(?P<fname>\w+)[^\S\n]*\((?P<params>.*?)\)[^\S\n]*(?P<ret>[^{\n]*)'
+    rb'|pub const [^\S\n]*(?P<tname>\w+)[^\S\n]*=[^\S\n]*(?P<tdef>[^{\n]*).*'
+    rb')',
+    re.MULTILINE
+)
 
 class DocGenerator:
+    # Below this many files, process pool startup costs more than it saves
+    _PARALLEL_THRESHOLD = 16
+    
+    # Parsed results keyed by source path, reused while mtime and size match
+    _CACHE_FILE = '.doc_cache.json'
+    _CACHE_VERSION = 2
+    
     def __init__(self, src_dir: str, docs_dir: str):
         self.src_dir = Path(src_dir)
         self.docs_dir = Path(docs_dir)
         self.api_docs = {}
-        
-    def extract_doc_comments(self, content: str) -> List[str]:
-        """Extract //! and /// comments from Zig source."""
-        doc_comments = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('//!'):
-                doc_comments.append(stripped[3:].strip())
-            elif stripped.startswith('///'):
-                doc_comments.append(stripped[3:].strip())
-                
-        return doc_comments
+        self._cache = {}
     
-    def extract_function_signatures(self, content: str) -> List[Dict]:
-        """Extract public function signatures and their documentation."""
+    def scan_declarations(self, content: bytes) -> Dict:
+        """Extract doc comments, public functions and types in a single pass."""
+        module_docs = []
         functions = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # Look for pub fn declarations
-            if stripped.startswith('pub fn '):
-                func_match = re.match(r'pub fn\s+(\w+)\s*\((.*?)\)\s*(.*?)(?:\{|$)', stripped)
-                if func_match:
-                    name = func_match.group(1)
-                    params = func_match.group(2)
-                    return_type = func_match.group(3)
-                    
-                    # Look for preceding comments
-                    doc_lines = []
-                    j = i - 1
-                    while j >= 0 and lines[j].strip().startswith('///'):
-                        doc_lines.insert(0, lines[j].strip()[3:].strip())
-                        j -= 1
-                    
-                    functions.append({
-                        'name': name,
-                        'params': params,
-                        'return_type': return_type.strip(),
-                        'documentation': '\n'.join(doc_lines) if doc_lines else '',
-                        'line': i + 1
-                    })
-        
-        return functions
-    
-    def extract_structs_and_enums(self, content: str) -> List[Dict]:
-        """Extract struct and enum definitions."""
         types = []
-        lines = content.split('\n')
+        pending_docs = []
+        pending_end = -1
+        line = 1
+        pos = 0
         
-        for i, line in enumerate(lines):
-            stripped = line.strip()
+        for match in _DECL_RE.finditer(content):
+            start = match.start()
+            line += content.count(b'\n', pos, start)
+            pos = start
             
-            # Look for pub const declarations that define types
-            if (stripped.startswith('pub const ') and 
-                ('struct' in stripped or 'union' in stripped or 'enum' in stripped)):
-                
-                type_match = re.match(r'pub const\s+(\w+)\s*=\s*(.*?)(?:\{|$)', stripped)
-                if type_match:
-                    name = type_match.group(1)
-                    type_def = type_match.group(2)
-                    
-                    # Look for preceding comments
-                    doc_lines = []
-                    j = i - 1
-                    while j >= 0 and lines[j].strip().startswith('///'):
-                        doc_lines.insert(0, lines[j].strip()[3:].strip())
-                        j -= 1
-                    
-                    types.append({
-                        'name': name,
-                        'type': type_def.strip(),
-                        'documentation': '\n'.join(doc_lines) if doc_lines else '',
-                        'line': i + 1
-                    })
+            marker = match.group('doc')
+            if marker:
+                text = match.group('text').decode('utf-8').strip()
+                module_docs.append(text)
+                if marker == b'///':
+                    # Only contiguous /// lines document the next declaration
+                    if start != pending_end + 1:
+                        pending_docs = []
+                    pending_docs.append(text)
+                    pending_end = match.end()
+                else:
+                    pending_docs = []
+                continue
+            
+            doc_lines = pending_docs if start == pending_end + 1 else []
+            pending_docs = []
+            
+            if match.group('fname'):
+                functions.append({
+                    'name': match.group('fname').decode('utf-8'),
+                    'params': match.group('params').decode('utf-8'),
+                    'return_type': match.group('ret').decode('utf-8').strip(),
+                    'documentation': '\n'.join(doc_lines),
+                    'line': line
+                })
+            elif any(kind in match.group(0) for kind in (b'struct', b'union', b'enum')):
+                types.append({
+                    'name': match.group('tname').decode('utf-8'),
+                    'type': match.group('tdef').decode('utf-8').strip(),
+                    'documentation': '\n'.join(doc_lines),
+                    'line': line
+                })
         
-        return types
+        return {
+            'module_docs': module_docs,
+            'functions': functions,
+            'types': types
+        }
     
     def process_source_file(self, file_path: Path) -> Dict:
-        """Process a single source file and extract documentation."""
+        """Process a single source file and extract documentation.
+        
+        Returns an empty dict when the file has nothing to document.
+        """
+        data = file_path.read_bytes()
+        
+        # Nothing to extract without public declarations or comments
+        if b'pub ' not in data and b'//' not in data:
+            return {}
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            declarations = self.scan_declarations(data)
         except UnicodeDecodeError:
             print(f"Warning: Could not read {file_path} as UTF-8")
             return {}
         
+        if not any(declarations.values()):
+            return {}
+        
         relative_path = file_path.relative_to(self.src_dir)
         
-        return {
-            'file': str(relative_path),
-            'module_docs': self.extract_doc_comments(content),
-            'functions': self.extract_function_signatures(content),
-            'types': self.extract_structs_and_enums(content)
-        }
+        return {'file': str(relative_path), **declarations}
+    
+    @staticmethod
+    def _process_path(src_dir: str, file_path: str) -> Dict:
+        """Process a source file in a worker process."""
+        return DocGenerator(src_dir, '').process_source_file(Path(file_path))
     
     def generate_api_reference(self) -> str:
         """Generate the API reference markdown."""
-        markdown = """# API Reference
-
-This is the complete API reference for zctor, automatically generated from source code.
-
-"""
+        parts = [
+            "# API Reference\n\n",
+            "This is the complete API reference for zctor, automatically generated from source code.\n\n",
+        ]
         
         for file_info in self.api_docs.values():
-            if not any([file_info['module_docs'], file_info['functions'], file_info['types']]):
-                continue
-                
-            markdown += f"## {file_info['file']}\n\n"
+            parts.append(f"## {file_info['file']}\n\n")
             
             # Module documentation
             if file_info['module_docs']:
-                markdown += "### Module Documentation\n\n"
+                parts.append("### Module Documentation\n\n")
                 for doc in file_info['module_docs']:
                     if doc:
-                        markdown += f"{doc}\n\n"
+                        parts.append(f"{doc}\n\n")
             
             # Types
             if file_info['types']:
-                markdown += "### Types\n\n"
+                parts.append("### Types\n\n")
                 for type_info in file_info['types']:
-                    markdown += f"#### `{type_info['name']}`\n\n"
-                    if type_info['documentation']:
-                        markdown += f"{type_info['documentation']}\n\n"
-                    markdown += f"```zig\n{type_info['type']}\n```\n\n"
+                    doc = type_info['documentation']
+                    parts.append(_TYPE_TEMPLATE.format(
+                        name=type_info['name'],
+                        doc=f"{doc}\n\n" if doc else '',
+                        type=type_info['type']))
             
             # Functions
             if file_info['functions']:
-                markdown += "### Functions\n\n"
+                parts.append("### Functions\n\n")
                 for func in file_info['functions']:
-                    markdown += f"#### `{func['name']}`\n\n"
-                    if func['documentation']:
-                        markdown += f"{func['documentation']}\n\n"
-                    
-                    signature = f"pub fn {func['name']}({func['params']})"
-                    if func['return_type']:
-                        signature += f" {func['return_type']}"
-                    
-                    markdown += f"```zig\n{signature}\n```\n\n"
+                    doc = func['documentation']
+                    ret = func['return_type']
+                    parts.append(_FUNC_TEMPLATE.format(
+                        name=func['name'],
+                        doc=f"{doc}\n\n" if doc else '',
+                        params=func['params'],
+                        ret=f" {ret}" if ret else ''))
             
-            markdown += "---\n\n"
+            parts.append("---\n\n")
         
-        return markdown
+        return ''.join(parts)
+    
+    def _load_cache(self):
+        """Load previously parsed source docs, if any."""
+        try:
+            cache_path = self.docs_dir / self._CACHE_FILE
+            data = json.loads(cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = None
+        
+        # Entries are only valid for the same format and source root
+        if (isinstance(data, dict) and
+                data.get('version') == self._CACHE_VERSION and
+                data.get('src_dir') == str(self.src_dir.resolve()) and
+                isinstance(data.get('files'), dict)):
+            self._cache = data['files']
+        else:
+            self._cache = {}
+    
+    def _save_cache(self):
+        """Persist parsed source docs for the next run."""
+        try:
+            cache_path = self.docs_dir / self._CACHE_FILE
+            data = {
+                'version': self._CACHE_VERSION,
+                'src_dir': str(self.src_dir.resolve()),
+                'files': self._cache
+            }
+            cache_path.write_text(json.dumps(data), encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Could not write doc cache: {e}")
     
     def scan_source_files(self):
         """Scan all Zig source files and extract documentation."""
-        for zig_file in self.src_dir.glob('**/*.zig'):
-            if zig_file.is_file():
-                file_info = self.process_source_file(zig_file)
-                if file_info:
-                    self.api_docs[str(zig_file)] = file_info
+        self._load_cache()
+        files = [p for p in self.src_dir.glob('**/*.zig') if p.is_file()]
+        
+        # Only entries for files that still exist are carried over
+        cache = {}
+        stale = []
+        for zig_file in files:
+            stat = zig_file.stat()
+            key = [stat.st_mtime_ns, stat.st_size]
+            entry = self._cache.get(str(zig_file))
+            if (isinstance(entry, dict) and entry.get('key') == key and
+                    isinstance(entry.get('info'), dict)):
+                cache[str(zig_file)] = entry
+            else:
+                cache[str(zig_file)] = {'key': key}
+                stale.append(zig_file)
+        
+        if len(stale) < self._PARALLEL_THRESHOLD:
+            results = [self.process_source_file(p) for p in stale]
+        else:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(self._process_path,
+                                            repeat(str(self.src_dir)),
+                                            [str(p) for p in stale]))
+        
+        for zig_file, file_info in zip(stale, results):
+            cache[str(zig_file)]['info'] = file_info
+        
+        self._cache = cache
+        self._save_cache()
+        
+        for zig_file in files:
+            file_info = cache[str(zig_file)]['info']
+            if file_info:
+                self.api_docs[str(zig_file)] = file_info
     
     def generate_table_of_contents(self) -> str:
         """Generate table of contents for the documentation."""
@@ -257,15 +322,13 @@ This is the complete API reference for zctor, automatically generated from sourc
         print("Generating API reference...")
         api_ref = self.generate_api_reference()
         api_ref_path = self.docs_dir / "05-api-reference.md"
-        with open(api_ref_path, 'w') as f:
-            f.write(api_ref)
+        api_ref_path.write_text(api_ref, encoding='utf-8')
         
         # Generate table of contents
         print("Generating table of contents...")
         toc = self.generate_table_of_contents()
         toc_path = self.docs_dir / "table-of-contents.md"
-        with open(toc_path, 'w') as f:
-            f.write(toc)
+        toc_path.write_text(toc, encoding='utf-8')
         
         print(f"Documentation generated in {self.docs_dir}")
         print(f"- API Reference: {api_ref_path}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental builds in docs/generate_book.py.
+Run with: python3 -m unittest discover -s tests
+"""
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "docs"))
+
+import generate_book
+from generate_book import BookGenerator
+
+HAVE_MARKDOWN = importlib.util.find_spec("markdown") is not None
+
+
+class BookRebuildTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.docs = Path(self._tmp.name)
+        self.chapter = self.docs / "01-introduction.md"
+        self.chapter.write_text("# Introduction\n\nOriginal text.\n", encoding='utf-8')
+        self.output = str(self.docs / "book.md")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def build(self, generator: BookGenerator) -> str:
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            generator.generate_combined_markdown(self.output)
+        return out.getvalue()
+
+    def edit_chapter(self):
+        with open(self.chapter, 'a', encoding='utf-8') as f:
+            f.write("EDIT-MARKER\n")
+
+    def test_unchanged_chapters_are_skipped(self):
+        self.build(BookGenerator(str(self.docs)))
+        self.assertIn("up to date", self.build(BookGenerator(str(self.docs))))
+
+    def test_edit_then_rebuild_with_same_generator(self):
+        generator = BookGenerator(str(self.docs))
+        self.build(generator)
+        self.edit_chapter()
+
+        self.assertIn("generated", self.build(generator))
+        book = Path(self.output).read_text(encoding='utf-8')
+        self.assertIn("EDIT-MARKER", book)
+
+        # A fresh generator must agree that the output is current
+        self.assertIn("up to date", self.build(BookGenerator(str(self.docs))))
+
+    def test_edit_then_rebuild_with_new_generator(self):
+        self.build(BookGenerator(str(self.docs)))
+        self.edit_chapter()
+
+        self.assertIn("generated", self.build(BookGenerator(str(self.docs))))
+        book = Path(self.output).read_text(encoding='utf-8')
+        self.assertIn("EDIT-MARKER", book)
+
+    def test_key_depends_on_format(self):
+        generator = BookGenerator(str(self.docs))
+        self.assertNotEqual(generator._chapters_key('markdown'),
+                            generator._chapters_key('html'))
+
+    def test_generator_change_forces_rebuild(self):
+        self.build(BookGenerator(str(self.docs)))
+        original = generate_book._GENERATOR_DIGEST
+        generate_book._GENERATOR_DIGEST = "changed"
+        try:
+            self.assertIn("generated", self.build(BookGenerator(str(self.docs))))
+        finally:
+            generate_book._GENERATOR_DIGEST = original
+
+    @unittest.skipUnless(HAVE_MARKDOWN, "markdown package not installed")
+    def test_markdown_then_html_to_same_path(self):
+        self.build(BookGenerator(str(self.docs)))
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            BookGenerator(str(self.docs)).generate_html(self.output)
+        self.assertIn("HTML book generated", out.getvalue())
+        self.assertTrue(Path(self.output).read_text(encoding='utf-8').startswith("<!DOCTYPE html>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
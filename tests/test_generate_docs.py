@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for declaration scanning and the source doc cache in docs/generate_docs.py.
+Run with: python3 -m unittest discover -s tests
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "docs"))
+
+from generate_docs import DocGenerator
+
+
+def func(name, params='', return_type='void', documentation='', line=1):
+    return {'name': name, 'params': params, 'return_type': return_type,
+            'documentation': documentation, 'line': line}
+
+
+def type_(name, type_def, documentation='', line=1):
+    return {'name': name, 'type': type_def, 'documentation': documentation, 'line': line}
+
+
+# (description, source, module_docs, functions, types)
+SCAN_CASES = [
+    ("blank line breaks doc chain",
+     b"/// a\n\npub fn f() void {\n",
+     ['a'], [func('f', line=3)], []),
+    ("plain comment breaks doc chain",
+     b"/// a\n// plain\npub fn f() void {\n",
+     ['a'], [func('f', line=3)], []),
+    ("module comment resets pending docs",
+     b"/// a\n//! mod\npub fn f() void {\n",
+     ['a', 'mod'], [func('f', line=3)], []),
+    ("crlf line endings",
+     b"/// doc\r\npub fn f(x: u8) u8 {\r\npub fn g() void\r\n",
+     ['doc'], [func('f', 'x: u8', 'u8', 'doc', 2), func('g', line=3)], []),
+    ("indented and tab-led declarations",
+     b"    /// a\n    pub fn f() void {\n\tpub fn g(a: u8) !void {\n",
+     ['a'], [func('f', documentation='a', line=2), func('g', 'a: u8', '!void', line=3)], []),
+    ("pub fn without closing paren",
+     b"pub fn f(\n    a: u8,\n) void {\n",
+     [], [], []),
+    ("non-type pub const clears pending docs",
+     b"/// a\npub const x = 1;\npub fn f() void {\n",
+     ['a'], [func('f', line=3)], []),
+    ("multi-line docs and line numbers",
+     b"//! Module.\n\n/// First.\n/// Second.\npub const E = enum(u8) {\n"
+     b"\n/// Runs.\npub fn run(self: *Self) !void {\n",
+     ['Module.', 'First.', 'Second.', 'Runs.'],
+     [func('run', 'self: *Self', '!void', 'Runs.', 8)],
+     [type_('E', 'enum(u8)', 'First.\nSecond.', 5)]),
+]
+
+
+class ScanDeclarationsTest(unittest.TestCase):
+    def test_scan_cases(self):
+        generator = DocGenerator(".", ".")
+        for description, source, module_docs, functions, types in SCAN_CASES:
+            with self.subTest(description):
+                result = generator.scan_declarations(source)
+                self.assertEqual(result['module_docs'], module_docs)
+                self.assertEqual(result['functions'], functions)
+                self.assertEqual(result['types'], types)
+
+    def test_invalid_utf8_in_captured_group_warns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bad.zig"
+            path.write_bytes(b"/// caf\xe9\npub fn f() void {\n")
+            generator = DocGenerator(tmp, tmp)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                result = generator.process_source_file(path)
+        self.assertEqual(result, {})
+        self.assertIn("Could not read", out.getvalue())
+
+
+class DocCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.docs = self.root / "docs"
+        self.docs.mkdir()
+        sub = self.root / "src" / "sub"
+        sub.mkdir(parents=True)
+        (sub / "a.zig").write_text("/// Adds.\npub fn add(a: u8) u8 {\n", encoding='utf-8')
+        (self.root / "src" / "empty.zig").write_text("const x = 1;\n", encoding='utf-8')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scan(self, src: str) -> DocGenerator:
+        generator = DocGenerator(str(self.root / src), str(self.docs))
+        generator.scan_source_files()
+        return generator
+
+    def test_cache_is_reused(self):
+        self.scan("src")
+        generator = self.scan("src")
+        files = [info['file'] for info in generator.api_docs.values()]
+        self.assertEqual(files, [str(Path("sub") / "a.zig")])
+
+    def test_src_dir_change_invalidates_cache(self):
+        self.scan("src")
+        generator = self.scan("src/sub")
+        files = [info['file'] for info in generator.api_docs.values()]
+        self.assertEqual(files, ["a.zig"])
+
+    def test_malformed_cache_is_ignored(self):
+        cache_path = self.docs / DocGenerator._CACHE_FILE
+        for content in ("[1]", "{not json", '{"version": 1, "files": []}'):
+            cache_path.write_text(content, encoding='utf-8')
+            generator = self.scan("src")
+            self.assertEqual(len(generator.api_docs), 1)
+
+    def test_entry_without_info_is_reparsed(self):
+        generator = self.scan("src")
+        for entry in generator._cache.values():
+            del entry['info']
+        generator._save_cache()
+        generator = self.scan("src")
+        self.assertEqual(len(generator.api_docs), 1)
+
+    def test_old_cache_version_is_discarded(self):
+        # Version 1 stored undocumented files as empty-list entries
+        empty = self.root / "src" / "empty.zig"
+        stat = empty.stat()
+        data = {
+            'version': 1,
+            'src_dir': str((self.root / "src").resolve()),
+            'files': {str(empty): {
+                'key': [stat.st_mtime_ns, stat.st_size],
+                'info': {'file': 'empty.zig', 'module_docs': [], 'functions': [], 'types': []}
+            }}
+        }
+        cache_path = self.docs / DocGenerator._CACHE_FILE
+        cache_path.write_text(json.dumps(data), encoding='utf-8')
+        generator = self.scan("src")
+        self.assertNotIn(str(empty), generator.api_docs)
+
+
+class ParallelScanTest(unittest.TestCase):
+    def test_pool_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            src = root / "src"
+            for i in range(20):
+                path = src / f"dir{i % 3}" / f"mod{i}.zig"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(f"//! Module {i}.\n/// Runs {i}.\npub fn run{i}(x: u8) void {{\n",
+                                encoding='utf-8')
+            (src / "private.zig").write_text("const x = 1;\n", encoding='utf-8')
+
+            results = []
+            for name, threshold in (("serial", 1000), ("pool", 0)):
+                docs = root / name
+                docs.mkdir()
+                generator = DocGenerator(str(src), str(docs))
+                generator._PARALLEL_THRESHOLD = threshold
+                generator.scan_source_files()
+                results.append(list(generator.api_docs.items()))
+
+        serial, pool = results
+        self.assertEqual(len(serial), 20)
+        self.assertEqual(pool, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()